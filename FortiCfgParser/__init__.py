@@ -14,7 +14,7 @@ from typing import Optional
 
 from ._config import FgtConfig, FgtConfigRoot, FgtConfigComments
 from ._config import FgtConfigObject, FgtConfigTable, FgtConfigSet, FgtConfigUnset
-from ._config import qus, uqs
+from ._config import qus, uqs, skeys
 from ._config import section_object, section_table
 from ._parser import FgtConfigRootFactory, FgtConfigParser
 
@@ -28,8 +28,7 @@ def parse_config(config: str, root_factory: Optional[FgtConfigRootFactory] = Non
     :raise FgtSyntaxError: if a syntax error is detected
     :raise FgtEosError: if an end of stream is encountered during the parsing.
     """
-    with io.StringIO(config) as config_stream:
-        return FgtConfigParser.parse(config_stream, root_factory)
+    return FgtConfigParser.parse(config, root_factory)
 
 
 def parse_file(file: str, root_factory: Optional[FgtConfigRootFactory] = None) -> FgtConfig:
@@ -24,10 +24,11 @@
                                         FgtConfigTable   FgtConfigObject
 """
 
+import functools
+import re
 from abc import ABC, abstractmethod
 from collections import deque
-from types import FunctionType
-from typing import Any, Union, Optional, Callable, TextIO, Iterator, final, TypeVar
+from typing import Any, Union, Optional, Callable, TextIO, Iterator, cast, final, TypeVar
 
 FgtConfigToken = str
 """ A token in a config file. A token is a sequence of characters. """
@@ -62,6 +63,12 @@ The filter function must return a boolean.  The config_text function does not ou
 current node if the filter returns True.
 """
 
+_QUS_TRANS = str.maketrans({'\\': '\\\\', '"': '\\"'})
+""" Translation table used to escape backslashes and quotes in a quoted string. """
+
+_UQS_RE = re.compile(r'\\(["\\])')
+""" Regular expression matching an escaped backslash or quote in a quoted string. """
+
 
 def uqs(arg: str) -> str:
     """ Return an unquoted string.
@@ -69,14 +76,10 @@ def uqs(arg: str) -> str:
     :param arg: a string
     :return: the unquoted string
     """
-    if len(arg) < 2:
-        res = arg
-    elif arg[0] != '"' or arg[-1] != '"':
-        res = arg
-    else:
-        res = arg.replace('\\"', '"').replace('\\\\', '\\')[1:-1]
+    if len(arg) < 2 or arg[0] != '"' or arg[-1] != '"':
+        return arg
 
-    return res
+    return _UQS_RE.sub(r'\1', arg[1:-1])
 
 
 def qus(arg: str) -> str:
@@ -85,7 +88,16 @@ def qus(arg: str) -> str:
     :param arg: a string
     :return: the quoted string
     """
-    return '"{}"'.format(arg.replace('\\', '\\\\').replace('"', '\\"'))
+    return '"' + arg.translate(_QUS_TRANS) + '"'
+
+
+def skeys(arg: dict[str, Any]) -> list[str]:
+    """ Return a case-insensitive sorted list of all keys in a dictionary.
+
+    :param arg: a dictionary
+    :return: the sorted keys
+    """
+    return sorted(arg, key=str.lower)
 
 
 class FgtConfigNode(ABC):
@@ -96,6 +108,7 @@ class FgtConfigNode(ABC):
     dictionary that maps a configuration parameter to the object.  The configuration parameter is
     never  stored in the object itself.
     """
+    __slots__ = ()
 
     @abstractmethod
     def traverse(self,
@@ -121,16 +134,13 @@ class FgtConfigNode(ABC):
         """
 
 
-class FgtConfigDict(dict[str, FgtConfigNode]):
-    """ A dictionary of configuration node children. """
+class FgtConfigBody(FgtConfigNode, dict[str, FgtConfigNode], ABC):
+    """ An abstract base class for a CONFIG table or a CONFIG object. """
+    __slots__ = ()
 
     def skeys(self) -> list[str]:
-        """ Return a sorted list of all keys in this dictionary. """
-        return sorted(self.keys(), key=lambda s: s.lower())
-
-
-class FgtConfigBody(FgtConfigNode, FgtConfigDict, ABC):
-    """ An abstract base class for a CONFIG table or a CONFIG object. """
+        """ Return a sorted list of all keys in this dictionary.  See `skeys`. """
+        return skeys(self)
 
     def traverse(self,
                  key: str,
@@ -159,12 +169,18 @@ class FgtConfigBody(FgtConfigNode, FgtConfigDict, ABC):
         :return: a pair consisting of the path (concatenated keys) and the node.
         """
         pending: deque[FgtConfigItem] = deque([(key, self)])
-        while len(pending) > 0:
-            path, node = pending.popleft()
-            if isinstance(node, (FgtConfigObject, FgtConfigTable)):
-                pending.extend([(path + delimiter + k, v) for k, v in node.items()])
+        pending_append = pending.append
+        pending_popleft = pending.popleft
+        while pending:
+            path, node = pending_popleft()
+            # the leaf classes are final, an exact type check avoids the ABC instance check.
+            node_type = type(node)
+            if node_type is FgtConfigSet or node_type is FgtConfigUnset:
                 yield path, node
-            elif isinstance(node, (FgtConfigSet, FgtConfigUnset)):
+            elif isinstance(node, FgtConfigBody):
+                prefix = path + delimiter
+                for k, v in node.items():
+                    pending_append((prefix + k, v))
                 yield path, node
             else:
                 raise TypeError()
@@ -270,10 +286,11 @@ class FgtConfigObject(FgtConfigBody):
         """ return the parameter value.  This method allows the use of object.param
         syntax equivalent to object.get('param')
         """
-        if key not in self.keys():
-            return super().__getattribute__(key)
+        # dunder names are probed by copy, pickle, ... they are never configuration parameters
+        if key.startswith('__'):
+            raise AttributeError(key)
 
-        attribute = self.get(key)
+        attribute = dict.get(self, key)
         if attribute is None:
             raise AttributeError(key)
         return attribute
@@ -323,6 +340,7 @@ class FgtConfigTable(FgtConfigBody):
 @final
 class FgtConfigSet(FgtConfigNode):
     """ Represents a SET command. """
+    __slots__ = ('_parameters',)
 
     def __init__(self, parameters: FgtConfigTokens) -> None:
         self._parameters = parameters
@@ -356,6 +374,7 @@ class FgtConfigSet(FgtConfigNode):
 @final
 class FgtConfigUnset(FgtConfigNode):
     """ Represents an UNSET command. """
+    __slots__ = ()
 
     def traverse(self,
                  key: str,
@@ -387,9 +406,19 @@ def section_object(config_key: Callable[[T], FgtConfigObject]) -> Callable[[T],
     |       return self.get('system global', FgtConfigObject())
 
     """
-    if isinstance(config_key, FunctionType):
+    if callable(config_key):
         key = config_key.__name__.replace("_", " ")
-        return lambda c: c.c_object(key)
+
+        # the section is looked up directly rather than through c_object to avoid a
+        # second function call on every access.
+        @functools.wraps(config_key)
+        def section(root: T) -> FgtConfigObject:
+            value = root[key]
+            if not isinstance(value, FgtConfigObject):
+                raise TypeError(f"'{key}' is not of type FgtConfigObject")
+            return value
+
+        return section
 
     raise TypeError()
 
@@ -401,9 +430,17 @@ def section_table(config_key: Callable[[T], FgtConfigTable]) -> Callable[[T], Fg
     configuration table.
 
     """
-    if isinstance(config_key, FunctionType):
+    if callable(config_key):
         key = config_key.__name__.replace("_", " ")
-        return lambda c: c.c_table(key)
+
+        @functools.wraps(config_key)
+        def section(root: T) -> FgtConfigTable:
+            value = root[key]
+            if not isinstance(value, FgtConfigTable):
+                raise TypeError(f"'{key}' is not of type FgtConfigTable")
+            return value
+
+        return section
 
     raise TypeError()
 
@@ -416,18 +453,18 @@ class FgtConfigRoot(FgtConfigObject):
                  partial_key: Optional[str] = None
                  ) -> Iterator[tuple[str, _FgtConfigSection]]:
         """ Return all sections in the root configuration. """
-        if partial_key is None:
+        # section names are made of words separated by a single space.
+        partial_key = " ".join(partial_key.split()) if partial_key is not None else ""
+        if not partial_key:
             for k, v in self.items():
                 if isinstance(v, (FgtConfigTable, FgtConfigObject)):
                     yield k, v
         else:
-            partial_key_parts = partial_key.split()
+            prefix = partial_key + " "
             for k, v in self.items():
-                if isinstance(v, (FgtConfigTable, FgtConfigObject)):
-                    k_parts = k.split()
-                    same = partial_key_parts == k_parts[:len(partial_key_parts)]
-                    if same:
-                        yield k, v
+                if ((k == partial_key or k.startswith(prefix))
+                        and isinstance(v, (FgtConfigTable, FgtConfigObject))):
+                    yield k, v
 
     def traverse(self,
                  key: str,
@@ -498,11 +535,11 @@ class FgtConfigRoot(FgtConfigObject):
 @final
 class FgtConfigComments(FgtConfigTokens):
     def _config_version(self) -> list[str]:
-        version = ["?-?"]
+        """ Return the fields of the #config-version comment. """
         for comment in self:
             if comment.startswith("#config-version="):
-                version = comment[16:].split(':')
-        return version
+                return comment[16:].split(':')
+        return ["?-?"]
 
     @property
     def version(self) -> str:
@@ -524,6 +561,7 @@ class FgtConfig(object):
     This object is created by calling `FgtParser.parse()`.
 
     """
+    __slots__ = ('_comments', '_root', '_vdoms', '_indent', '_indents')
 
     def __init__(self,
                  comments: FgtConfigComments,
@@ -543,6 +581,7 @@ class FgtConfig(object):
         self._root: FgtConfigRoot = root
         self._vdoms: dict[str, FgtConfigRoot] = vdoms
         self._indent: int = 4
+        self._indents: tuple[str, ...] = tuple(' ' * (i * self._indent) for i in range(128))
 
     @property
     def comments(self) -> FgtConfigComments:
@@ -552,7 +591,7 @@ class FgtConfig(object):
     @property
     def has_vdom(self) -> bool:
         """ Return true if the firewall is configured with VDOMs"""
-        return len(self._vdoms) > 0
+        return bool(self._vdoms)
 
     @property
     def root(self) -> FgtConfigRoot:
@@ -569,6 +608,89 @@ class FgtConfig(object):
         """ Return a dictionary of VDOMs. """
         return self._vdoms
 
+    def _iter_section_lines(self,
+                            root: FgtConfigRoot,
+                            item_filter: Optional[FgtConfigFilterCallback],
+                            data: Optional[Any]
+                            ) -> Iterator[str]:
+        """ Yield the configuration lines of all sections in `root`.
+
+        The configuration tree is traversed in depth-first order using an explicit stack of
+        iterators over the items of the CONFIG objects and tables being generated.  SET and
+        UNSET commands are output in the inner loop, only CONFIG objects and tables are pushed
+        on the stack.
+        """
+        parents: FgtConfigStack = deque()
+        stack: list[tuple[Iterator[FgtConfigItem], bool]] = []
+        items: Iterator[FgtConfigItem] = iter(root.items())
+        in_object = True
+        indent = ''
+
+        while True:
+            for key, value in items:
+                # the leaf classes are final, an exact type check avoids the ABC instance check.
+                value_type = type(value)
+                if value_type is FgtConfigSet:
+                    if item_filter is None or item_filter((key, value), parents, data):
+                        params = cast(FgtConfigSet, value).params
+                        yield indent + 'set ' + key + ' ' + ' '.join(params)
+                elif value_type is FgtConfigUnset:
+                    if item_filter is None or item_filter((key, value), parents, data):
+                        yield indent + 'unset ' + key
+                elif isinstance(value, dict):
+                    # enter the config section, the items of the parent are resumed once the
+                    # section is generated.
+                    if item_filter is None or item_filter((key, value), parents, data):
+                        yield indent + ('config ' if in_object else 'edit ') + key
+                    stack.append((items, in_object))
+                    parents.append((key, value))
+                    items = iter(value.items())
+                    in_object = isinstance(value, FgtConfigObject)
+                    indent = self._indent_of(len(parents))
+                    break
+                else:
+                    raise ValueError()
+            else:
+                # all items are generated, leave the config section.
+                if not stack:
+                    return
+                items, in_object = stack.pop()
+                item = parents.pop()
+                indent = self._indent_of(len(parents))
+                if item_filter is None or item_filter(item, parents, data):
+                    yield indent + ('end' if in_object else 'next')
+
+    def _indent_of(self, depth: int) -> str:
+        """ Return the spaces prefixing a line at the given depth in the configuration tree. """
+        indents = self._indents
+        return indents[depth] if depth < len(indents) else ' ' * (depth * self._indent)
+
+    def _iter_lines(self,
+                    item_filter: Optional[FgtConfigFilterCallback],
+                    data: Optional[Any]
+                    ) -> Iterator[str]:
+        """ Yield the configuration lines.  See `make_config`. """
+        if self.has_vdom:
+            yield ''
+            yield 'config vdom'
+            for k in self.vdoms.keys():
+                yield 'edit ' + k
+                yield 'next'
+            yield 'end'
+            yield ''
+            yield 'config global'
+            yield from self._iter_section_lines(self.root, item_filter, data)
+            yield 'end'
+            yield ''
+            for k, v in self.vdoms.items():
+                yield 'config vdom'
+                yield 'edit ' + k
+                yield from self._iter_section_lines(v, item_filter, data)
+                yield 'end'
+                yield ''
+        else:
+            yield from self._iter_section_lines(self.root, item_filter, data)
+
     def make_config(self,
                     item_filter: Optional[FgtConfigFilterCallback] = None,
                     data: Optional[Any] = None
@@ -581,63 +703,7 @@ class FgtConfig(object):
                             true.
         :param data: optional data passed to the item_filter callback.
         """
-
-        def append_entry(begin_of_section: bool,
-                         item: FgtConfigItem,
-                         parents: FgtConfigStack,
-                         output_list: list[str]
-                         ) -> None:
-
-            # check if we skip this item
-            if item_filter and not item_filter(item, parents, data):
-                return
-
-            # extract key, value from the given item
-            key = item[0]
-            value = item[1]
-
-            if isinstance(value, FgtConfigSet):
-                line = f"set {key} {' '.join(value.params)}"
-            elif isinstance(value, FgtConfigUnset):
-                line = f"unset {key}"
-            elif isinstance(value, (FgtConfigTable, FgtConfigObject)):
-                if len(parents) == 0 or isinstance(parents[-1][1], FgtConfigObject):
-                    line = f"config {key}" if begin_of_section else "end"
-                elif len(parents) > 0 or isinstance(parents[-1][1], FgtConfigTable):
-                    line = f"edit {key}" if begin_of_section else "next"
-                else:
-                    raise ValueError()
-            else:
-                raise ValueError()
-
-            # create indentation spaces to prefix the line
-            spaces: str = ' ' * (len(parents) * self._indent)
-
-            # append it to the output list
-            output_list.append(spaces + line)
-
-        output: list[str] = []
-        if self.has_vdom:
-            output.append('')
-            output.append('config vdom')
-            for k in self.vdoms.keys():
-                output.append('edit ' + k)
-                output.append('next')
-            output.append('end')
-            output.append('')
-            output.append('config global')
-            self.root.traverse('', append_entry, deque(), output)
-            output.append('end')
-            output.append('')
-            for k, v in self.vdoms.items():
-                output.append('config vdom')
-                output.append('edit ' + k)
-                v.traverse('', append_entry, deque(), output)
-                output.append('end')
-                output.append('')
-        else:
-            self.root.traverse('', append_entry, deque(), output)
-        return output
+        return list(self._iter_lines(item_filter, data))
 
     def __repr__(self) -> str:
         return "\n".join(self.make_config())
@@ -657,8 +723,6 @@ class FgtConfig(object):
                             returns true.
         :param data: optional data passed to the item_filter callback.
         """
-        if include_comments and len(self.comments) > 0:
-            file.write("\n".join(self.comments))
-            file.write("\n")
-        file.write("\n".join(self.make_config(item_filter, data)))
-        file.write("\n")
+        if include_comments and self.comments:
+            file.writelines(comment + "\n" for comment in self.comments)
+        file.writelines(line + "\n" for line in self._iter_lines(item_filter, data))
@@ -5,7 +5,7 @@
 # SPDX-License-Identifier: GPL-3.0-only
 #
 
-from dataclasses import dataclass
+import re
 from typing import Optional, Final, Union, cast, Callable, final, TextIO
 
 from ._config import (FgtConfig, FgtConfigToken, FgtConfigTokens, FgtConfigSet, FgtConfigObject,
@@ -15,18 +15,50 @@ from ._config import (FgtConfig, FgtConfigToken, FgtConfigTokens, FgtConfigSet,
 _Char = str
 """ The _Char type represents a single character."""
 
-FgtConfigRootFactory = Callable[[str, FgtConfigObject], FgtConfigRoot]
-""" Callable used to instantiate a `FgConfigRoot`.  """
+_EOS: Final[_Char] = ''
+""" The end of stream token. """
+
+_EOL_CH: Final[_Char] = '\n'
+""" The end of line token. """
+
+_VDOM: Final = 'vdom'
+""" The name of the config command defining a vdom. """
+
+_TOKEN_RE = re.compile(r"""
+    [^\S\n]*                            # spaces, the new line is a delimiter
+    (?:
+        ([^\s"\#]\S*)                   # a word (unquoted string), the most frequent token
+      | (\n)                            # an end of line
+      | ("[^"\\]*(?:\\.[^"\\]*)*")      # a quoted string with escaped characters
+      | (\#[^\n]*)\n?                   # a comment, the end of line is consumed
+    )?
+    """, re.VERBOSE | re.DOTALL)
+""" Match the next token in a configuration, the token is in the matching group.
+The alternatives are ordered by decreasing frequency.  The characters are classified by the
+regex engine while the configuration is scanned. """
 
+_WORD_GROUP: Final = 1
+""" The group of `_TOKEN_RE` matching a word. """
 
-@dataclass
-class _StreamPosition:
-    """ A position in a stream of characters """
-    row: int
-    col: int
+_KEYWORDS: Final = {k: k for k in ('config', 'edit', 'end', 'next', 'set', 'unset', 'vdom')}
+""" The reserved words used by the parser. """
 
-    def __repr__(self):
-        return f"({self.row}, {self.col})"
+_SPACES_RE = re.compile(r'\s*')
+""" Match spaces and new lines. """
+
+_SHARED_MAX_LENGTH: Final = 32
+""" SET parameters shorter than this length are shared.  Short parameters such as enable,
+disable, interface names, ... are repeated many times in a configuration, they share a single
+string object during a parse. """
+
+_EOL_TOKENS: Final = frozenset((_EOL_CH, _EOS))
+""" The tokens terminating a line : an end of line or the end of stream. """
+
+_QUOTED_PREFIX_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+""" Match a quoted string without its closing quote. """
+
+FgtConfigRootFactory = Callable[[str, FgtConfigObject], FgtConfigRoot]
+""" Callable used to instantiate a `FgConfigRoot`.  """
 
 
 class FgtConfigSyntaxError(Exception):
@@ -72,73 +104,56 @@ class FgtConfigParser(object):
     FortiGate configuration syntax is partially described in
     https://docs.fortinet.com/document/fortigate/7.2.3/administration-guide/508024/command-syntax
     """
-    VDOM: Final[str] = 'vdom'
+    VDOM: Final[str] = _VDOM
 
     @final
     class Lexer:
+        __slots__ = ('_data', '_index', '_token', 'strings')
+
         # Special characters
-        EOS: Final[_Char] = ''         # end of stream
-        EOL: Final[_Char] = '\n'       # end of line
+        EOS: Final[_Char] = _EOS       # end of stream
+        EOL: Final[_Char] = _EOL_CH    # end of line
         QUOTE: Final[_Char] = '\"'
 
-        def __init__(self, input_stream: TextIO) -> None:
-            """ Initialize the lexer """
-            self._stream = input_stream
-            self._char: Optional[_Char] = None
-            self._pos: _StreamPosition = _StreamPosition(1, 1)
+        def __init__(self, input_stream: Union[TextIO, str]) -> None:
+            """ Initialize the lexer.
+
+            :param input_stream: a stream or a string containing the configuration.
+            """
+            # The lexer works on the configuration in memory.  A stream is read in a single
+            # call, a string is used as-is without copying it in a StringIO buffer.  The
+            # current position in the configuration is the index of the next character.
+            self._data: str = input_stream if isinstance(input_stream, str) else input_stream.read()
+            self._index: int = 0
             self._token: Optional[FgtConfigToken] = None
 
-        def _update_position(self, c: _Char) -> None:
-            """ Keep track of the (line, column) position in the input stream """
-            self._pos.col += 1
-            if c == self.EOL:
-                self._pos.row += 1
-                self._pos.col = 1
+            # Configuration keys and short SET parameters are shared through this dictionary,
+            # each string is mapped to itself.  It only lives as long as the lexer.
+            self.strings: dict[str, str] = {}
 
         @classmethod
         def _is_eol(cls, token: FgtConfigToken) -> bool:
             """ Return true if `token` is an end of line.  """
-            return token in (cls.EOL, cls.EOS)
+            return token in _EOL_TOKENS
 
         @classmethod
         def is_eos(cls, token: FgtConfigToken) -> bool:
             """ Return true if `token` is an end of stream.  """
-            return token == cls.EOS
+            return token == _EOS
 
         @classmethod
         def is_comment(cls, token: FgtConfigToken) -> bool:
             """ Return true if `token` is a comment """
             return token[0] == "#"
 
-        def _next(self) -> _Char:
-            """ Return the next character from the input stream. An EOS character
-            is returned when the stream is exhausted. The EOS character is represented
-            as an empty string. """
-            if self._char is None:
-                c = self._stream.read(1)
-                self._update_position(c)
-            else:
-                c = self._char
-                self._char = None
-
-            return c
-
-        def _unget(self, c: _Char) -> None:
-            """ Push back the character so that it becomes available when calling _next """
-            self._char = c
+        def get_pos(self) -> tuple[int, int]:
+            """ Return the current position (row, col) in the stream.
 
-        def _next_ns(self) -> _Char:
-            """ Return the next non-space character including EOF or EOL.
-                \\\\n is used as a delimiter and not considered as a space.
+            The position is computed on demand, it is only needed to report errors.
             """
-            c = self._next()
-            while c.isspace() and not self._is_eol(c):
-                c = self._next()
-            return c
-
-        def get_pos(self) -> _StreamPosition:
-            """ Return the current position in the stream. """
-            return self._pos
+            index = self._index
+            return (self._data.count(_EOL_CH, 0, index) + 1,
+                    index - self._data.rfind(_EOL_CH, 0, index))
 
         def push_token(self, token: FgtConfigToken) -> None:
             """ Push back the given token get by the `next_token` method """
@@ -160,51 +175,31 @@ class FgtConfigParser(object):
                 token = self._token
                 self._token = None
             else:
-                c: _Char = self._next_ns()
+                data = self._data
+                # every group of `_TOKEN_RE` is optional, the regex always matches.
+                m = _TOKEN_RE.match(data, self._index)
+                assert m is not None
+                kind = m.lastindex
+                if kind is not None:
+                    # an end of line, a comment, a quoted string or a word
+                    token = m.group(kind)
+                    self._index = m.end()
+                    if kind == _WORD_GROUP:
+                        # use the same string object for every occurrence of a reserved word
+                        token = _KEYWORDS.get(token, token)
+                else:
+                    self._index = index = m.end()
+                    if index < len(data):
+                        # Only a quoted string without the closing quote can't be matched
+                        prefix = _QUOTED_PREFIX_RE.match(data, index)
+                        assert prefix is not None
+                        end = prefix.end()
+                        if end < len(data):
+                            raise FgtConfigSyntaxError("syntax error: escape error")
+                        raise FgtConfigSyntaxError("syntax error: unbalanced quote")
 
-                if self.is_eos(c):
                     # This is the end of the characters stream
-                    token = c
-
-                elif self._is_eol(c):
-                    # This is an end of line, just return it
-                    token = c
-
-                elif c == '#':
-                    # This is a comment line, fill the token until the end of line is encountered
-                    token = ''
-                    while not self._is_eol(c):
-                        token += c
-                        c = self._next()
-
-                elif c == self.QUOTE:
-                    # a quoted string
-                    token = c
-                    while True:
-                        c = self._next()
-                        if self.is_eos(c):
-                            raise FgtConfigSyntaxError("syntax error: unbalanced quote")
-
-                        if c == '\\':
-                            token += c
-                            c = self._next()
-                            if self.is_eos(c):
-                                raise FgtConfigSyntaxError("syntax error: escape error")
-                            token += c
-
-                        elif c == self.QUOTE:
-                            token += c
-                            break
-                        else:
-                            token += c
-
-                else:
-                    # this is a word (unquoted string), fill until a space is found
-                    token = ""
-                    while not (c.isspace() or self._is_eol(c)):
-                        token += c
-                        c = self._next()
-                    self._unget(c)
+                    token = _EOS
 
             return token
 
@@ -214,12 +209,16 @@ class FgtConfigParser(object):
 
             :return: a list of tokens
             """
-            tokens: FgtConfigTokens = FgtConfigTokens()
-            while not self._is_eol(token := self.next_token()):
-                if self.is_comment(token):
+            # FgtConfigTokens is an alias of list, a list literal avoids calling the generic
+            # alias.  Bound methods are resolved once, outside the loop.
+            tokens: FgtConfigTokens = []
+            tokens_append = tokens.append
+            next_token = self.next_token
+            while (token := next_token()) not in _EOL_TOKENS:
+                if token[0] == '#':
                     raise FgtConfigSyntaxError(
                         f"syntax error: unexpected comment found at {self.get_pos()}")
-                tokens.append(token)
+                tokens_append(token)
 
             return tokens
 
@@ -231,15 +230,36 @@ class FgtConfigParser(object):
             :return: a token
             :raise FgtEosError: if an end of stream is encountered before a new token is available.
             """
-            token = self.next_token()
-            while self._is_eol(token) and not self.is_eos(token):
-                token = self.next_token()
-
-            if raise_eos and self.is_eos(token):
+            if self._token is None:
+                # skip all spaces and new lines in a single step, the regex always matches.
+                spaces = _SPACES_RE.match(self._data, self._index)
+                assert spaces is not None
+                self._index = spaces.end()
+
+            next_token = self.next_token
+            token = next_token()
+            while token == _EOL_CH:
+                token = next_token()
+
+            if raise_eos and token == _EOS:
                 raise FgtConfigEosError()
 
             return token
 
+        def peek_snl_token(self, raise_eos: bool = True) -> FgtConfigToken:
+            """ Return the token that the next call to `next_snl_token` will return.  The token
+            remains available until `consume` is called.
+
+            :return: a token
+            :raise FgtEosError: if an end of stream is encountered before a new token is available.
+            """
+            self._token = self.next_snl_token(raise_eos)
+            return self._token
+
+        def consume(self) -> None:
+            """ Discard the token returned by `peek_snl_token` """
+            self._token = None
+
     @classmethod
     def _parse_set_command(cls, lexer: Lexer) -> tuple[str, FgtConfigSet]:
         """ Parse a SET command.
@@ -250,11 +270,37 @@ class FgtConfigParser(object):
         :return: the parameter name and a `FgtConfigSet` object containing all values.
         :raise FgtSyntaxError: if the set command can not be parsed.
         """
-        tokens: FgtConfigTokens = lexer.next_parameters()
-        if len(tokens) < 2:
+        # fast path for the most common command : set <parameter_name> <parameter_value>
+        next_token = lexer.next_token
+        values: FgtConfigTokens
+        name = next_token()
+        if name not in _EOL_TOKENS and name[0] != '#':
+            value = next_token()
+            if value not in _EOL_TOKENS and value[0] != '#':
+                token = next_token()
+                if token in _EOL_TOKENS:
+                    if len(value) < _SHARED_MAX_LENGTH:
+                        value = lexer.strings.setdefault(value, value)
+                    return name, FgtConfigSet([value])
+                values = [value]
+            else:
+                token = value
+                values = []
+        else:
+            # the name is missing, the values are always empty
+            token = name
+            values = []
+
+        # general case, the last token read is pushed back and the remaining values are read.
+        # The name is kept apart from the values, no list is sliced.
+        lexer.push_token(token)
+        values += lexer.next_parameters()
+        if not values:
             raise FgtConfigSyntaxError(f"syntax error: invalid set command at {lexer.get_pos()}")
 
-        return tokens[0], FgtConfigSet(tokens[1:])
+        shared = lexer.strings.setdefault
+        return name, FgtConfigSet(
+            [shared(p, p) if len(p) < _SHARED_MAX_LENGTH else p for p in values])
 
     @classmethod
     def _parse_unset_command(cls, lexer: Lexer) -> tuple[str, FgtConfigUnset]:
@@ -279,6 +325,7 @@ class FgtConfigParser(object):
         :return: the parameter name and a `FgtConfigNode` object.
         :raise FgtSyntaxError: if the configuration command can not be parsed.
         """
+        # the lexer shares the reserved word strings, the comparisons succeed on identity.
         if entry == 'set':
             return cls._parse_set_command(lexer)
 
@@ -315,17 +362,24 @@ class FgtConfigParser(object):
         #               end
         #       end
         #
-        config = FgtConfigObject()
-        token: FgtConfigToken = lexer.next_snl_token()
-        while not ((token == 'next') or (vdom and token == 'end')):
-            k, v = cls._parse_config_command(token, lexer)
-            config[k] = v
-            token = lexer.next_snl_token()
-
-        if vdom and token == 'end':
-            lexer.push_token(token)
+        # the commands are collected and the config object is built from the list of pairs.
+        pairs: list[tuple[str, FgtConfigNode]] = []
+        shared = lexer.strings.setdefault
+        token: FgtConfigToken
+        if vdom:
+            # the end keyword is left in the lexer, it terminates the config vdom command.
+            while (token := lexer.peek_snl_token()) != 'end':
+                lexer.consume()
+                if token == 'next':
+                    break
+                k, v = cls._parse_config_command(token, lexer)
+                pairs.append((shared(k, k), v))
+        else:
+            while (token := lexer.next_snl_token()) != 'next':
+                k, v = cls._parse_config_command(token, lexer)
+                pairs.append((shared(k, k), v))
 
-        return edit_key[0], config
+        return edit_key[0], FgtConfigObject(pairs)
 
     @classmethod
     def _parse_config(cls, lexer: Lexer) -> tuple[str, Union[FgtConfigTable, FgtConfigObject]]:
@@ -336,30 +390,33 @@ class FgtConfigParser(object):
         """
         # get config keys
         config_keys: FgtConfigTokens = lexer.next_parameters()
-        if len(config_keys) == 0:
+        if not config_keys:
             raise FgtConfigSyntaxError(
                 f"syntax error: invalid config at position {lexer.get_pos()}")
 
         # parse until end keyword
         token = lexer.next_snl_token()
         config: Union[FgtConfigTable, FgtConfigObject]
+        pairs: list[tuple[str, FgtConfigNode]] = []
+        shared = lexer.strings.setdefault
         if token == 'edit':
             # it is a table object : config name \n edit 1\n next\n edit 2\n next\n end\n
-            config = FgtConfigTable()
+            # The edit keys are unique in a table, they are not shared.
+            vdom = config_keys[0] == _VDOM
             while token != 'end':
-                kt, vt = cls._parse_table_entry(lexer, config_keys[0] == FgtConfigParser.VDOM)
-                config[kt] = vt
+                pairs.append(cls._parse_table_entry(lexer, vdom))
 
                 token = lexer.next_snl_token()
+            config = FgtConfigTable(pairs)
         else:
             # it is a config object such as :
             # config name\n set name1 value1\nset name2 value2\nconfig subconf\nend\nend
-            config = FgtConfigObject()
             while token != 'end':
                 ck, cv = cls._parse_config_command(token, lexer)
-                config[ck] = cv
+                pairs.append((shared(ck, ck), cv))
 
                 token = lexer.next_snl_token()
+            config = FgtConfigObject(pairs)
 
         return " ".join(config_keys), config
 
@@ -370,12 +427,12 @@ class FgtConfigParser(object):
 
     @classmethod
     def parse(cls,
-              input_stream: TextIO,
+              input_stream: Union[TextIO, str],
               root_factory: Optional[FgtConfigRootFactory] = None
               ) -> FgtConfig:
         """ Parse a FortiGate configuration.
 
-        :param input_stream: the configuration
+        :param input_stream: the configuration, a stream or a string.
         :param root_factory: a function that returns a :py:class:`FgtRootConfig` subclass.
         :return: a FgtConfig object
         :raise FgtSyntaxError: if a syntax error is detected
@@ -391,7 +448,7 @@ class FgtConfigParser(object):
         # allocate various dictionaries
         comments = FgtConfigComments()
         global_config = FgtConfigObject()
-        vdoms_config = dict[str, FgtConfigRoot]()
+        vdoms_objects = dict[str, FgtConfigObject]()
 
         # parse the configuration stream
         lexer = cls.Lexer(input_stream)
@@ -404,15 +461,16 @@ class FgtConfigParser(object):
         while not lexer.is_eos(token):
             if token == 'config':
                 k, v = cls._parse_config(lexer)
-                if k == FgtConfigParser.VDOM:
+                if k == _VDOM:
                     # a vdom is detected.  The vdom configuration file contains duplicate entries.
                     # The first definition is a table declaring the name of the different vdoms.
                     # The second definition contains the actual configuration.  In our
                     # implementation the first definition is overloaded by the second occurrence.
-                    # It does not matter since we preserve the name of the vdom.
+                    # It does not matter since we preserve the name of the vdom.  The root
+                    # configurations are only created once all vdom definitions are known.
                     for entry, value in v.items():
                         if isinstance(value, FgtConfigObject):
-                            vdoms_config[entry] = factory(comments.version, value)
+                            vdoms_objects[entry] = value
                         else:
                             raise TypeError(type(value))
                 else:
@@ -427,8 +485,11 @@ class FgtConfigParser(object):
         # Handle vdom and non vdom configurations.
         # A vdom config has a unique config global section and multiple config vdom sections.
         # A non vdom config has multiple config sections.
+        vdoms_config = {
+            entry: factory(comments.version, value) for entry, value in vdoms_objects.items()
+        }
         config_section: FgtConfigObject
-        if len(vdoms_config) == 0:
+        if not vdoms_config:
             config_section = global_config
         else:
             config_section = cast(FgtConfigObject, global_config['global'])
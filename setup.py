@@ -0,0 +1,50 @@
+#
+# This file is part of FortiCfgParser -  A parser for FortiGate Configuration Files
+#
+# Copyright (C) 2022  Jean Noel Meurisse
+# SPDX-License-Identifier: GPL-3.0-only
+#
+
+"""
+    Optional native build of FortiCfgParser.
+
+    The package is a pure-Python package.  When the FORTICFG_CYTHON environment variable
+    is set, the parser modules are compiled in place with Cython.  The `.py` files remain
+    the source of truth, the pure-Python implementation is used when the package is
+    installed without this variable.
+
+    Example:
+    |   pip install cython
+    |   FORTICFG_CYTHON=1 pip install --no-build-isolation .
+"""
+
+import os
+
+from setuptools import setup
+
+_COMPILED_MODULES = [
+    "FortiCfgParser/_config.py",
+    "FortiCfgParser/_parser.py",
+]
+
+
+def _ext_modules() -> list:
+    """ Return the list of extension modules to build. """
+    if not os.environ.get("FORTICFG_CYTHON"):
+        return []
+
+    # Cython is only required when a native build is explicitly requested.
+    from Cython.Build import cythonize
+
+    extensions = cythonize(_COMPILED_MODULES, language_level=3)
+
+    # a module that fails to compile is installed as a pure-Python module.
+    for extension in extensions:
+        extension.optional = True
+    return extensions
+
+
+setup(
+    packages=["FortiCfgParser"],
+    ext_modules=_ext_modules(),
+)
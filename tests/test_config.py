@@ -2,7 +2,8 @@ import io
 import unittest
 from typing import cast
 
-from FortiCfgParser import parse_file, FgtConfigRoot, section_table, FgtConfigTable
+from FortiCfgParser import (parse_file, FgtConfigRoot, section_table, FgtConfigTable, FgtConfigSet,
+                            qus, uqs)
 from tests import make_test_path
 
 
@@ -63,8 +64,24 @@ class TestConfig(unittest.TestCase):
 
         for k, v in config_root.sections("router  bgp"):
             self.assertEqual("router bgp", k)
+        self.assertEqual(1, len(list(config_root.sections("router  bgp"))))
 
         section_count = 0
         for _, _ in config_root.sections('router'):
             section_count += 1
         self.assertEqual(8, section_count)
+
+    def test_quote(self) -> None:
+        self.assertEqual('"abc"', qus('abc'))
+        self.assertEqual('"a\\"b\\\\c"', qus('a"b\\c'))
+        self.assertEqual('abc', uqs('"abc"'))
+        self.assertEqual('a"b\\c', uqs('"a\\"b\\\\c"'))
+        self.assertEqual('abc', uqs('abc'))
+        self.assertEqual('"', uqs('"'))
+        for value in ('', 'a', '\\', '"', '\\"', 'a\\\\"b'):
+            self.assertEqual(value, uqs(qus(value)))
+
+    def test_set(self) -> None:
+        parameters = ['value1', 'value2']
+        config_set = FgtConfigSet(parameters)
+        self.assertIs(parameters, config_set.params)
@@ -73,3 +73,29 @@ class TestLexer(unittest.TestCase):
         lexer = FgtConfigParser.Lexer(m)
         with self.assertRaises(FgtConfigSyntaxError):
             lexer.next_token()
+
+    def test_lexer_9(self):
+        lexer = FgtConfigParser.Lexer('config A "B C"\n')
+        self.assertEqual(lexer.next_token(), 'config')
+        self.assertListEqual(lexer.next_parameters(), ['A', '"B C"'])
+        self.assertEqual(lexer.next_token(), FgtConfigParser.Lexer.EOS)
+
+    def test_lexer_10(self):
+        lexer = FgtConfigParser.Lexer('A B\n  CD\n')
+        self.assertEqual(repr(lexer.get_pos()), '(1, 1)')
+        self.assertEqual(lexer.next_token(), 'A')
+        self.assertEqual(repr(lexer.get_pos()), '(1, 2)')
+        self.assertEqual(lexer.next_token(), 'B')
+        self.assertEqual(lexer.next_token(), FgtConfigParser.Lexer.EOL)
+        self.assertEqual(repr(lexer.get_pos()), '(2, 1)')
+        self.assertEqual(lexer.next_token(), 'CD')
+        self.assertEqual(repr(lexer.get_pos()), '(2, 5)')
+
+    def test_lexer_11(self):
+        lexer = FgtConfigParser.Lexer('\n\n  A\n\nB')
+        self.assertEqual(lexer.peek_snl_token(), 'A')
+        self.assertEqual(lexer.peek_snl_token(), 'A')
+        self.assertEqual(lexer.next_snl_token(), 'A')
+        self.assertEqual(lexer.peek_snl_token(), 'B')
+        lexer.consume()
+        self.assertEqual(lexer.peek_snl_token(raise_eos=False), FgtConfigParser.Lexer.EOS)
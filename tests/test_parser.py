@@ -3,7 +3,7 @@ from collections import deque
 
 from FortiCfgParser import (parse_config, FgtConfig, FgtConfigObject, FgtConfigTable,
                             FgtConfigSet, FgtConfigRoot)
-from FortiCfgParser._parser import FgtConfigSyntaxError
+from FortiCfgParser._parser import FgtConfigSyntaxError, FgtConfigEosError, FgtConfigParser
 
 
 class TestParser(unittest.TestCase):
@@ -147,6 +147,14 @@ class TestParser(unittest.TestCase):
         self.assertEqual(config.comments.version, '?')
         self.assertEqual(config.comments.model, '?')
 
+    def test_comments_4(self):
+        config = parse_config("")
+        self.assertEqual(config.comments.version, '?')
+        config.comments.append('#config-version=FGT60E-7.0:opmode=0')
+        self.assertEqual(config.comments.version, '7.0')
+        config.comments.clear()
+        self.assertEqual(config.comments.model, '?')
+
     def test_section_1(self):
         config_text = \
             """
@@ -231,6 +239,54 @@ class TestParser(unittest.TestCase):
             nodes.append(node[0])
         self.assertListEqual(paths, nodes)
 
+    def test_deep(self):
+        depth = 200
+        lines = []
+        for level in range(depth):
+            lines.append(' ' * (4 * level) + f"config level{level}")
+        lines.append(' ' * (4 * depth) + "set param1 value1")
+        lines.append(' ' * (4 * depth) + "unset param2")
+        for level in reversed(range(depth)):
+            lines.append(' ' * (4 * level) + "end")
+        config_text = "\n".join(lines)
+        self.assertMultiLineEqual(str(parse_config(config_text)), config_text)
+
+    def test_filter(self):
+        config_text = \
+            """
+                config test
+                    set param1 value1
+                    unset param2
+                    config table
+                        edit 1
+                            set param3 value3
+                        next
+                        edit 2
+                        next
+                    end
+                end
+            """
+
+        def item_filter(item, parents, data):
+            data.append((item[0], len(parents)))
+            return item[0] not in ('param1', 'table')
+
+        items = []
+        config = parse_config(config_text)
+        self.assertListEqual(config.make_config(item_filter, items),
+                             ['config test',
+                              '    unset param2',
+                              '        edit 1',
+                              '            set param3 value3',
+                              '        next',
+                              '        edit 2',
+                              '        next',
+                              'end'])
+        self.assertListEqual(items,
+                             [('test', 0), ('param1', 1), ('param2', 1), ('table', 1),
+                              ('1', 2), ('param3', 3), ('1', 2), ('2', 2), ('2', 2),
+                              ('table', 1), ('test', 0)])
+
     def test_traverse(self):
         config_text = \
             """
@@ -323,6 +379,20 @@ class TestParser(unittest.TestCase):
         with self.assertRaises(FgtConfigSyntaxError):
             parse_config(config_text)
 
+    def test_error_set(self):
+        for config_text, message in (("config test\n    set param1\nend", "invalid set command"),
+                                     ("config test\n    set param1 #c\nend", "unexpected comment"),
+                                     ("config test\n    set p1 v1 #c\nend", "unexpected comment"),
+                                     ("config test\n    set p1 \"v1\\", "escape error")):
+            with self.assertRaisesRegex(FgtConfigSyntaxError, message):
+                parse_config(config_text)
+
+        with self.assertRaises(FgtConfigEosError):
+            parse_config("config test\n    set param1 value1")
+        config = parse_config("config test\n    set param1 value1 value2 value3\nend")
+        self.assertListEqual(config.root.c_object('test').c_set('param1').params,
+                             ['value1', 'value2', 'value3'])
+
     def test_error_5(self):
         config_text = \
             """
@@ -341,3 +411,59 @@ class TestParser(unittest.TestCase):
         with self.assertRaises(TypeError):
             config_root.c_object('test').opt('param4')
         self.assertTrue(config_root.c_object('test').same('param5', 'value5', 'value5'))
+
+    def test_set_update(self):
+        config_text = "config test\n    set param1 value1 value2\nend"
+        config = parse_config(config_text)
+        self.assertMultiLineEqual(str(config), config_text)
+
+        config_set = config.root.c_object('test').c_set('param1')
+        config_set[1] = 'value3'
+        self.assertMultiLineEqual(str(config), config_text.replace('value2', 'value3'))
+        config_set.params.append('value4')
+        self.assertMultiLineEqual(str(config), config_text.replace('value2', 'value3 value4'))
+
+    def test_set_strings(self):
+        config_text = "config test\n    set param1 port1\n    set param2 port1 port2\nend"
+        config_object = parse_config(config_text).root.c_object('test')
+        self.assertIs(config_object.c_set('param1')[0], config_object.c_set('param2')[0])
+
+    def test_vdom_factory(self):
+        config_text = \
+            """
+                config vdom
+                    edit root
+                    next
+                    edit dmz
+                    next
+                end
+                config global
+                end
+                config vdom
+                    edit root
+                        config system settings
+                            set status enable
+                        end
+                end
+            """
+        roots = []
+
+        def factory(_: str, a_map: FgtConfigObject) -> FgtConfigRoot:
+            roots.append(FgtConfigRoot(a_map))
+            return roots[-1]
+
+        config = parse_config(config_text, factory)
+        self.assertEqual(len(roots), 3)
+        self.assertListEqual(list(config.vdoms.keys()), ['root', 'dmz'])
+        self.assertIn('system settings', config.vdoms['root'])
+        self.assertEqual(len(config.vdoms['dmz']), 0)
+
+    def test_parser_override(self):
+        class UpperParser(FgtConfigParser):
+            @classmethod
+            def _parse_set_command(cls, lexer):
+                k, v = super()._parse_set_command(lexer)
+                return k, FgtConfigSet([p.upper() for p in v.params])
+
+        config = UpperParser.parse("config test\n    set param1 x\nend")
+        self.assertListEqual(config.root.c_object('test').c_set('param1').params, ['X'])